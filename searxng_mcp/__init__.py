@@ -13,6 +13,7 @@ __email__ = "you@example.com"
 # Import main components for easy access
 from .config import *
 from .browser import *
+from .client import *
 from .scraper import *
 from .search import *
 from .utils import *
@@ -20,18 +21,26 @@ from .utils import *
 __all__ = [
     # Config
     "USER_AGENT", "REQUESTS_TIMEOUT", "BROWSER_TIMEOUT",
-    "MAX_CONTENT_LENGTH", "MAX_NUM_RESULTS", "SEARXNG_URL",
-    "MAX_RETRIES", "RETRY_DELAY",
+    "MAX_CONTENT_LENGTH", "MAX_NUM_RESULTS", "MAX_RESPONSE_BYTES", "SEARXNG_URL",
+    "SEARXNG_ENGINES", "MAX_SEARCH_RESPONSE_BYTES", "SEARCH_CACHE_TTL",
+    "SEARCH_CACHE_SIZE",
+    "MAX_RETRIES", "RETRY_DELAY", "MAX_PARALLEL_SCRAPES", "PARSE_WORKERS",
+    "PREWARM_BROWSER", "MAX_BROWSER_PAGES", "BROWSER_LAUNCH_COOLDOWN", "BLOCKED_RESOURCE_TYPES",
+    "SCRAPE_CACHE_TTL", "SCRAPE_CACHE_SIZE",
+    "CIRCUIT_BREAKER_THRESHOLD", "CIRCUIT_BREAKER_COOLDOWN",
     
     # Browser
-    "get_browser", "cleanup_browser", "is_browser_available",
+    "get_browser", "get_context", "acquire_page", "release_page", "cleanup_browser", "is_browser_available",
+    
+    # Client
+    "get_client", "read_body", "cleanup_client",
     
     # Scraper
-    "ScrapeConfig", "scrape_pages", "clean_html",
+    "ScrapeConfig", "scrape_pages", "parse_page", "clean_html", "detect_encoding",
     
     # Search
     "search_web", "validate_num_results",
     
     # Utils
-    "handle_exceptions", "format_error"
+    "handle_exceptions", "format_error", "gather_with_progress", "TTLCache"
 ]
\ No newline at end of file
@@ -1,35 +1,71 @@
 """Browser management for web scraping with Playwright."""
 
 import asyncio
+import time
 from typing import Optional
 
+from .config import (
+    BLOCKED_RESOURCE_TYPES,
+    BROWSER_LAUNCH_COOLDOWN,
+    MAX_BROWSER_PAGES,
+    MAX_RETRIES,
+    RETRY_DELAY,
+    USER_AGENT,
+)
+
 # Global browser instance for reuse across calls
 _playwright_instance = None
 _browser_instance = None
+_context_instance = None
 
+# Serializes browser and context creation across concurrent scrapes
+_browser_lock = asyncio.Lock()
 
-async def get_browser():
+# Error and time of the last failed launch; until BROWSER_LAUNCH_COOLDOWN
+# has passed, callers get this error instead of relaunching one by one
+_launch_error: Optional[str] = None
+_launch_failed_at = 0.0
+
+# Pool of idle pages in the shared context; the semaphore bounds how many
+# pages exist (idle or in use) at any time
+_idle_pages = []
+_page_slots = asyncio.Semaphore(MAX_BROWSER_PAGES)
+
+
+def _connected_browser():
+    """Return the current browser if it is still connected, else None."""
+    global _browser_instance
+    
+    if _browser_instance is not None:
+        try:
+            if _browser_instance.is_connected():
+                return _browser_instance
+        except Exception as e:
+            pass
+        _browser_instance = None
+    
+    return None
+
+
+async def _launch_browser():
     """
-    Get or create a persistent browser instance.
+    Start Playwright and launch Chromium, retrying transient failures.
     
-    The browser is created once and reused across all scraping calls
-    for better performance.
+    Attempts are spaced with exponential backoff. Once they are used up
+    the Playwright driver is stopped, so the next launch starts a fresh
+    one, and the failure is raised as RuntimeError, which scrapers treat
+    as final rather than wrapping another round of launches around it.
+    
+    Must be called with _browser_lock held.
     
     Returns:
-        Browser: Playwright browser instance
+        Browser: Newly launched Playwright browser instance
         
     Raises:
-        RuntimeError: If Playwright is not installed
+        RuntimeError: If Playwright is not installed or the browser
+            cannot be launched
     """
-    global _playwright_instance, _browser_instance
-    
-    # Return existing browser if still connected
-    if _browser_instance is not None:
-        try:
-            if _browser_instance.is_connected():
-                return _browser_instance
-        except Exception as e:
-            _browser_instance = None
+    global _playwright_instance, _browser_instance, _launch_error, _launch_failed_at
     
     # Import Playwright - raise helpful error if not installed
     try:
@@ -41,17 +77,210 @@ async def get_browser():
             "  uv run playwright install chromium"
         )
     
-    # Start Playwright if needed
-    if _playwright_instance is None:
-        _playwright_instance = await async_playwright().start()
+    for attempt in range(MAX_RETRIES):
+        try:
+            # Start Playwright if needed
+            if _playwright_instance is None:
+                _playwright_instance = await async_playwright().start()
+            
+            # Launch browser
+            _browser_instance = await _playwright_instance.chromium.launch(
+                headless=True,
+                args=['--no-sandbox', '--disable-setuid-sandbox']  # Better compatibility
+            )
+            _launch_error = None
+            return _browser_instance
+            
+        except Exception as e:
+            if attempt < MAX_RETRIES - 1:
+                await asyncio.sleep(RETRY_DELAY * (2 ** attempt))
+                continue
+            
+            # The driver itself may be what died; start over next time
+            if _playwright_instance is not None:
+                try:
+                    await _playwright_instance.stop()
+                except Exception as e:
+                    pass
+                _playwright_instance = None
+            
+            _launch_error = f"Failed to launch browser: {type(e).__name__}: {str(e)}"
+            _launch_failed_at = time.monotonic()
+            raise RuntimeError(_launch_error) from e
+
+
+async def _ensure_browser():
+    """
+    Return the connected browser, launching it if needed.
+    
+    Must be called with _browser_lock held.
+    
+    Returns:
+        Browser: Playwright browser instance
+        
+    Raises:
+        RuntimeError: If Playwright is not installed, or a launch failed
+            less than BROWSER_LAUNCH_COOLDOWN seconds ago
+    """
+    browser = _connected_browser()
+    if browser is not None:
+        return browser
+    
+    # A launch failed recently; don't start another round of attempts
+    if _launch_error is not None and time.monotonic() - _launch_failed_at < BROWSER_LAUNCH_COOLDOWN:
+        raise RuntimeError(_launch_error)
+    
+    return await _launch_browser()
+
+
+async def get_browser():
+    """
+    Get or create a persistent browser instance.
     
-    # Launch browser
-    _browser_instance = await _playwright_instance.chromium.launch(
-        headless=True,
-        args=['--no-sandbox', '--disable-setuid-sandbox']  # Better compatibility
-    )
+    The browser is created once and reused across all scraping calls
+    for better performance. Launching is serialized by a lock so that
+    concurrent callers arriving while no browser is running share a
+    single launch instead of each starting their own.
     
-    return _browser_instance
+    Returns:
+        Browser: Playwright browser instance
+        
+    Raises:
+        RuntimeError: If Playwright is not installed or the browser
+            cannot be launched
+    """
+    # Lock-free fast path once the browser is up
+    browser = _connected_browser()
+    if browser is not None:
+        return browser
+    
+    async with _browser_lock:
+        # Another caller may have launched it while we waited
+        return await _ensure_browser()
+
+
+async def _route_request(route):
+    """Abort requests for resource types that scraping never uses."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _close_popup(page):
+    """
+    Close tabs opened by scraped pages (window.open, target=_blank links).
+    
+    Pool pages come from context.new_page() and have no opener, so only
+    popups are affected. Without this they would live as long as the
+    shared context since Chromium runs with popup blocking disabled.
+    """
+    try:
+        if await page.opener() is not None:
+            await page.close()
+    except Exception as e:
+        pass
+
+
+async def get_context():
+    """
+    Get or create a persistent browser context.
+    
+    A single context is shared by all browser scrapes so each page is
+    a lightweight tab rather than a fresh context with its own storage.
+    Requests for BLOCKED_RESOURCE_TYPES (images, fonts, ...) are aborted
+    since their content is discarded anyway. The context is recreated if
+    the underlying browser was relaunched.
+    
+    Returns:
+        BrowserContext: Playwright browser context
+        
+    Raises:
+        RuntimeError: If Playwright is not installed or the browser
+            cannot be launched
+    """
+    global _context_instance
+    
+    # Lock-free fast path: existing context belongs to the live browser
+    browser = _connected_browser()
+    if (
+        browser is not None
+        and _context_instance is not None
+        and _context_instance.browser is browser
+    ):
+        return _context_instance
+    
+    async with _browser_lock:
+        browser = await _ensure_browser()
+        
+        # Another caller may have built the context while we waited
+        if _context_instance is not None and _context_instance.browser is browser:
+            return _context_instance
+        
+        _context_instance = await browser.new_context(
+            user_agent=USER_AGENT,
+            java_script_enabled=True,
+            viewport={"width": 1280, "height": 800}
+        )
+        
+        _context_instance.on("page", _close_popup)
+        
+        if BLOCKED_RESOURCE_TYPES:
+            await _context_instance.route("**/*", _route_request)
+        
+        return _context_instance
+
+
+async def acquire_page():
+    """
+    Borrow a page from the pool, creating one if none is idle.
+    
+    Waits while MAX_BROWSER_PAGES pages are already in use. Every page
+    returned must be handed back with release_page().
+    
+    Returns:
+        Page: Playwright page in the shared browser context
+        
+    Raises:
+        RuntimeError: If Playwright is not installed or the browser
+            cannot be launched
+    """
+    await _page_slots.acquire()
+    try:
+        context = await get_context()
+        
+        # Reuse an idle page unless it died or belongs to an old context
+        while _idle_pages:
+            page = _idle_pages.pop()
+            if not page.is_closed() and page.context is context:
+                return page
+        
+        return await context.new_page()
+    except BaseException:
+        _page_slots.release()
+        raise
+
+
+async def release_page(page):
+    """
+    Return a page to the pool after use.
+    
+    The page is navigated to about:blank so it stops running scripts and
+    frees the previous document; pages that cannot be reset are closed.
+    
+    Args:
+        page: Page previously obtained from acquire_page()
+    """
+    try:
+        await page.goto("about:blank")
+        _idle_pages.append(page)
+    except Exception as e:
+        try:
+            await page.close()
+        except Exception as e:
+            pass
+    finally:
+        _page_slots.release()
 
 
 async def cleanup_browser():
@@ -59,9 +288,20 @@ async def cleanup_browser():
     Clean up browser resources.
     
     Should be called when shutting down the server to properly
-    close the browser and Playwright instances.
+    close the browser context, browser and Playwright instances.
     """
-    global _playwright_instance, _browser_instance
+    global _playwright_instance, _browser_instance, _context_instance
+    
+    # Pooled pages are closed along with their context
+    _idle_pages.clear()
+    
+    if _context_instance is not None:
+        try:
+            await _context_instance.close()
+        except Exception as e:
+            pass
+        finally:
+            _context_instance = None
     
     if _browser_instance is not None:
         try:
@@ -0,0 +1,73 @@
+"""Shared async HTTP client for search and scraping."""
+
+from typing import Optional
+
+import httpx
+
+from .config import REQUESTS_TIMEOUT, USER_AGENT
+
+# Global HTTP client instance for reuse across calls
+_client_instance: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Get or create a persistent async HTTP client.
+    
+    The client is created once and reused across all search and scrape
+    calls so connections (and HTTP/2 sessions) are pooled.
+    
+    Returns:
+        httpx.AsyncClient: Shared HTTP client instance
+    """
+    global _client_instance
+    
+    if _client_instance is None or _client_instance.is_closed:
+        _client_instance = httpx.AsyncClient(
+            http2=True,
+            timeout=REQUESTS_TIMEOUT,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    
+    return _client_instance
+
+
+async def read_body(response: httpx.Response, limit: int) -> bytes:
+    """
+    Read a streamed response body, stopping once ``limit`` bytes are in.
+    
+    Args:
+        response: Streaming httpx response
+        limit: Maximum number of bytes to read
+        
+    Returns:
+        Raw (decompressed) body, at most ``limit`` bytes long
+    """
+    chunks = []
+    total = 0
+    async for chunk in response.aiter_bytes(65536):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= limit:
+            break
+    
+    return b"".join(chunks)[:limit]
+
+
+async def cleanup_client():
+    """
+    Close the shared HTTP client.
+    
+    Should be called when shutting down the server to release
+    pooled connections.
+    """
+    global _client_instance
+    
+    if _client_instance is not None:
+        try:
+            await _client_instance.aclose()
+        except Exception as e:
+            pass
+        finally:
+            _client_instance = None
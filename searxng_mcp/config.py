@@ -24,10 +24,44 @@ BROWSER_TIMEOUT: Final[int] = int(os.getenv("BROWSER_TIMEOUT", "30000"))  # mill
 # Content limits
 MAX_CONTENT_LENGTH: Final[int] = int(os.getenv("MAX_CONTENT_LENGTH", "10000"))  # characters
 MAX_NUM_RESULTS: Final[int] = int(os.getenv("MAX_NUM_RESULTS", "50"))
+MAX_RESPONSE_BYTES: Final[int] = int(os.getenv("MAX_RESPONSE_BYTES", "5000000"))  # bytes of raw HTML read per page
+
+# Launch the browser at server startup instead of on the first browser scrape
+PREWARM_BROWSER: Final[bool] = os.getenv("PREWARM_BROWSER", "1") == "1"
+
+# Maximum number of pooled browser pages (also caps concurrent browser scrapes)
+MAX_BROWSER_PAGES: Final[int] = int(os.getenv("MAX_BROWSER_PAGES", "3"))
+
+# After a browser launch fails, browser scrapes fail fast for this long instead of relaunching
+BROWSER_LAUNCH_COOLDOWN: Final[float] = float(os.getenv("BROWSER_LAUNCH_COOLDOWN", "30"))  # seconds, 0 disables
+
+# Browser resource types aborted before download (comma-separated Playwright resource types)
+BLOCKED_RESOURCE_TYPES: Final[frozenset] = frozenset(
+    t.strip() for t in os.getenv("BLOCKED_RESOURCE_TYPES", "image,media,font,stylesheet").split(",")
+    if t.strip()
+)
 
 # SearXNG configuration
 SEARXNG_URL: Final[str] = os.getenv("SEARXNG_URL", "http://localhost:8080")
+SEARXNG_ENGINES: Final[str] = os.getenv("SEARXNG_ENGINES", "")  # comma-separated, empty uses instance defaults
+MAX_SEARCH_RESPONSE_BYTES: Final[int] = int(os.getenv("MAX_SEARCH_RESPONSE_BYTES", "2000000"))
 
 # Retry configuration
 MAX_RETRIES: Final[int] = int(os.getenv("MAX_RETRIES", "3"))
 RETRY_DELAY: Final[float] = float(os.getenv("RETRY_DELAY", "1.0"))  # seconds
+
+# Scrape cache configuration
+SCRAPE_CACHE_TTL: Final[float] = float(os.getenv("SCRAPE_CACHE_TTL", "300"))  # seconds, 0 disables
+SCRAPE_CACHE_SIZE: Final[int] = int(os.getenv("SCRAPE_CACHE_SIZE", "512"))  # entries
+
+# Search cache configuration
+SEARCH_CACHE_TTL: Final[float] = float(os.getenv("SEARCH_CACHE_TTL", "60"))  # seconds, 0 disables
+SEARCH_CACHE_SIZE: Final[int] = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))  # entries
+
+# Circuit breaker configuration (per host, for page scraping)
+CIRCUIT_BREAKER_THRESHOLD: Final[int] = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "3"))  # consecutive failures, 0 disables
+CIRCUIT_BREAKER_COOLDOWN: Final[float] = float(os.getenv("CIRCUIT_BREAKER_COOLDOWN", "60"))  # seconds
+
+# Concurrency configuration
+MAX_PARALLEL_SCRAPES: Final[int] = int(os.getenv("MAX_PARALLEL_SCRAPES", "5"))
+PARSE_WORKERS: Final[int] = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 4)))  # HTML parsing threads
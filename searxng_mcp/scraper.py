@@ -1,22 +1,89 @@
 """Web scraping functionality with requests and browser support."""
 
 import asyncio
-from typing import Dict, List, Literal
+import codecs
+import hashlib
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Literal, Optional, Tuple, Union
 
-import requests
-from bs4 import BeautifulSoup
+import httpx
+from lxml import etree
 from pydantic import BaseModel, Field
 from typing_extensions import Annotated
+from urllib.parse import urlparse
 
-from .browser import get_browser
+from .browser import acquire_page, release_page
+from .client import get_client, read_body
 from .config import (
     BROWSER_TIMEOUT,
+    CIRCUIT_BREAKER_COOLDOWN,
+    CIRCUIT_BREAKER_THRESHOLD,
     MAX_CONTENT_LENGTH,
+    MAX_PARALLEL_SCRAPES,
+    MAX_RESPONSE_BYTES,
     MAX_RETRIES,
+    PARSE_WORKERS,
     REQUESTS_TIMEOUT,
     RETRY_DELAY,
-    USER_AGENT,
+    SCRAPE_CACHE_SIZE,
+    SCRAPE_CACHE_TTL,
 )
+from .utils import ProgressCallback, TTLCache, gather_with_progress
+
+# Elements dropped (with everything nested inside them) by tag name
+_UNWANTED_TAGS = frozenset({
+    'script', 'style', 'nav', 'footer',
+    'aside', 'noscript', 'iframe', 'svg'
+})
+
+# Very specific non-content class names (exact, case-insensitive token matches only).
+# Avoiding broad patterns like 'header', 'nav', 'menu' to prevent removing
+# content from frameworks like Notion, Next.js, etc.
+_NON_CONTENT_CLASSES = frozenset({
+    "advertisement", "cookie-banner", "cookie-consent",
+    "popup-overlay", "modal-overlay", "ad-container",
+})
+
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_:.-]+)""",
+    re.IGNORECASE
+)
+
+# Bytes inspected when guessing the encoding of undeclared documents
+_SNIFF_BYTES = 4096
+
+# Incremental decoder class, so a multi-byte sequence cut off by the sniff
+# window is not mistaken for invalid UTF-8
+_Utf8Decoder = codecs.getincrementaldecoder("utf-8")
+
+# Thread pool for CPU-bound HTML parsing, so the event loop keeps
+# serving network I/O for other pages meanwhile
+_parse_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+
+# Consecutive network failures per host: host[:port] -> (failures, time of last failure)
+_host_failures: Dict[str, Tuple[int, float]] = {}
+
+# Fields (and fallbacks) of every scrape_pages record, after the url
+_RECORD_DEFAULTS = {
+    "status": "error",
+    "method": "",
+    "title": "",
+    "content": "",
+    "length": 0,
+    "original_length": 0,
+    "truncated": False,
+    "error": "",
+}
+
+# Successful scrape results keyed on (url, method, wait_time)
+_scrape_cache = TTLCache(SCRAPE_CACHE_TTL, SCRAPE_CACHE_SIZE)
+
+# Extracted (title, text) keyed on a hash of the raw body, so identical
+# documents are only parsed and cleaned once
+_content_cache = TTLCache(None, SCRAPE_CACHE_SIZE)
 
 
 class ScrapeConfig(BaseModel):
@@ -39,7 +106,178 @@ class ScrapeConfig(BaseModel):
     ] = 3
 
 
-def clean_html(soup: BeautifulSoup) -> str:
+class _TextLimitReached(Exception):
+    """Raised by _TextTarget to stop parsing once enough text is collected."""
+
+
+class _TextTarget:
+    """
+    lxml parser target that collects page text without building a tree.
+    
+    Only body content is kept: <head> and elements with unwanted tags or
+    non-content class names are skipped together with everything nested
+    inside them. The first <title> is captured separately. With a
+    ``limit``, parsing is aborted once that many non-whitespace characters
+    of text have been collected, and ``limit_reached`` is set.
+    """
+    
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.size = 0
+        self.limit_reached = False
+        self.parts = []
+        self.title_parts = []
+        self.skip_depth = 0
+        self.in_title = False
+        self.seen_title = False
+    
+    def start(self, tag, attrib):
+        if tag == "title" and not self.seen_title:
+            self.in_title = True
+        
+        if self.skip_depth:
+            self.skip_depth += 1
+            return
+        
+        # Most elements carry no class, so only split it when there is one
+        class_name = attrib.get("class")
+        is_junk = bool(class_name) and not _NON_CONTENT_CLASSES.isdisjoint(class_name.lower().split())
+        if tag == "head" or tag in _UNWANTED_TAGS or is_junk:
+            self.skip_depth = 1
+        
+        # Element boundaries separate words, like get_text(separator=' ')
+        self.parts.append(" ")
+    
+    def end(self, tag):
+        if self.in_title and tag == "title":
+            self.in_title = False
+            self.seen_title = True
+        
+        if self.skip_depth:
+            self.skip_depth -= 1
+            if self.skip_depth:
+                return
+        
+        self.parts.append(" ")
+    
+    def data(self, data):
+        if self.in_title:
+            self.title_parts.append(data)
+        if not self.skip_depth:
+            self.parts.append(data)
+            if self.limit is not None:
+                # Indentation is collapsed by normalization, so only count
+                # characters that survive it
+                self.size += (
+                    len(data) - data.count(" ") - data.count("\n")
+                    - data.count("\t") - data.count("\r")
+                )
+                if self.size >= self.limit:
+                    self.limit_reached = True
+                    raise _TextLimitReached()
+    
+    def close(self):
+        title = "".join(self.title_parts).strip()
+        text = ' '.join("".join(self.parts).split())
+        return title, text, self.limit_reached
+
+
+def detect_encoding(body: bytes) -> str:
+    """
+    Cheaply determine the charset of an HTML document without a declared one.
+    
+    Checks for a byte order mark, then a <meta> charset declaration, and
+    finally whether the document starts as valid UTF-8. Only the first
+    few KB are inspected instead of running statistical detection over
+    the whole body.
+    
+    Args:
+        body: Raw HTML bytes
+        
+    Returns:
+        Encoding name to decode the document with
+    """
+    if body.startswith(codecs.BOM_UTF8):
+        return "utf-8"
+    if body.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    
+    head = body[:_SNIFF_BYTES]
+    match = _META_CHARSET_RE.search(head)
+    if match:
+        charset = match.group(1).decode("ascii")
+        # A <meta> readable as ASCII can't be UTF-16/32; per the HTML spec
+        # such declarations mean UTF-8
+        if charset.lower().replace("-", "").replace("_", "").startswith(("utf16", "utf32")):
+            return "utf-8"
+        return charset
+    
+    return _sniff_utf8(head)
+
+
+def _sniff_utf8(head: bytes) -> str:
+    """Return utf-8 if ``head`` decodes as (possibly cut off) UTF-8, else windows-1252."""
+    try:
+        _Utf8Decoder().decode(head)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "windows-1252"  # The HTML default for legacy pages
+
+
+def parse_page(
+    html: Union[str, bytes],
+    encoding: Optional[str] = None,
+    max_length: Optional[int] = None
+) -> Tuple[str, str, bool]:
+    """
+    Parse an HTML document and extract its title and clean text.
+    
+    The document is fed through lxml's parser with a target that keeps
+    only text from content elements, so no DOM is ever materialized and
+    peak memory stays proportional to the extracted text.
+    
+    With ``max_length``, parsing stops once four times that many
+    non-whitespace characters are collected, so the rest of a huge page
+    is never parsed or normalized. The text is then cut short, which is
+    reported by the third element of the result.
+    
+    Args:
+        html: Raw HTML as text or bytes
+        encoding: Declared charset of byte input (e.g. from the Content-Type
+            header); when omitted it is detected with detect_encoding()
+        max_length: Length the caller will truncate the text to, if any
+        
+    Returns:
+        Tuple of (title, clean text content with normalized whitespace,
+        whether extraction stopped early at the ``max_length`` limit)
+    """
+    if not isinstance(html, bytes):
+        encoding = None  # Only byte input can carry a charset
+    elif not encoding:
+        encoding = detect_encoding(html)
+    
+    target = _TextTarget(max_length * 4 if max_length else None)
+    try:
+        parser = etree.HTMLParser(target=target, encoding=encoding)
+    except LookupError:
+        # Unknown declared charset, detect it from the document instead
+        try:
+            parser = etree.HTMLParser(target=target, encoding=detect_encoding(html))
+        except LookupError:
+            # The <meta> charset is unknown as well
+            parser = etree.HTMLParser(target=target, encoding=_sniff_utf8(html[:_SNIFF_BYTES]))
+    
+    try:
+        return etree.fromstring(html, parser)
+    except _TextLimitReached:
+        return target.close()
+
+
+def clean_html(
+    html: Union[str, bytes],
+    encoding: Optional[str] = None,
+    max_length: Optional[int] = None
+) -> str:
     """
     Remove unwanted tags and extract clean text from HTML.
     
@@ -49,44 +287,81 @@ def clean_html(soup: BeautifulSoup) -> str:
     class names containing common words.
     
     Args:
-        soup: BeautifulSoup parsed HTML document
+        html: Raw HTML as text or bytes
+        encoding: Declared charset of byte input
+        max_length: Length the caller will truncate the text to, if any
         
     Returns:
         Clean text content with normalized whitespace
     """
-    # Remove unwanted elements by tag name
-    unwanted_tags = [
-        'script', 'style', 'nav', 'footer',
-        'aside', 'noscript', 'iframe', 'svg'
-    ]
-    for tag in soup.find_all(unwanted_tags):
-        tag.decompose()
-    
-    # Remove elements with very specific non-content patterns (exact matches only)
-    # Avoiding broad patterns like 'header', 'nav', 'menu' to prevent removing
-    # content from frameworks like Notion, Next.js, etc.
-    non_content_classes = [
-        'advertisement', 'cookie-banner', 'cookie-consent',
-        'popup-overlay', 'modal-overlay', 'ad-container'
-    ]
-    for element in soup.find_all(class_=lambda x: x and any(
-        pattern == str(c).lower() for c in (x if isinstance(x, list) else [x]) 
-        for pattern in non_content_classes
-    )):
-        element.decompose()
+    return parse_page(html, encoding, max_length)[1]
+
+
+def _scrape_error(method: str, message: str) -> Dict:
+    """Build the error result for a failed scrape."""
+    return {
+        "status": "error",
+        "method": method,
+        "error": message,
+        "title": "",
+        "content": "",
+        "length": 0
+    }
+
+
+def _circuit_open(host: Optional[str]) -> bool:
+    """
+    Check whether a host has failed often enough recently to be skipped.
+    
+    Args:
+        host: Host (and port) of the URL being scraped
+        
+    Returns:
+        True if requests to the host should be short-circuited
+    """
+    if not host or CIRCUIT_BREAKER_THRESHOLD <= 0:
+        return False
     
-    # Get text content with space separator
-    text = soup.get_text(separator=' ', strip=True)
+    failures, last_failure = _host_failures.get(host, (0, 0.0))
+    if failures < CIRCUIT_BREAKER_THRESHOLD:
+        return False
     
-    # Normalize whitespace (collapse multiple spaces/newlines)
-    text = ' '.join(text.split())
+    return time.monotonic() - last_failure < CIRCUIT_BREAKER_COOLDOWN
+
+
+def _record_failure(host: Optional[str]) -> None:
+    """
+    Count a network failure (timeout, connection error) against a host.
+    
+    Hosts whose last failure is older than CIRCUIT_BREAKER_COOLDOWN are
+    forgotten here, so the table only holds recently failing hosts.
+    """
+    if not host or CIRCUIT_BREAKER_THRESHOLD <= 0:
+        return
     
-    return text
+    now = time.monotonic()
+    stale = [
+        name for name, (_, last_failure) in _host_failures.items()
+        if now - last_failure >= CIRCUIT_BREAKER_COOLDOWN
+    ]
+    for name in stale:
+        del _host_failures[name]
+    
+    failures, _ = _host_failures.get(host, (0, 0.0))
+    _host_failures[host] = (failures + 1, now)
+
+
+def _record_success(host: Optional[str]) -> None:
+    """Reset a host's failure count after it answered."""
+    _host_failures.pop(host, None)
 
 
 async def scrape_with_requests(url: str) -> Dict:
     """
-    Scrape a webpage using requests (static HTML).
+    Scrape a webpage using a plain HTTP fetch (static HTML).
+    
+    Hosts that keep timing out or refusing connections are skipped for
+    CIRCUIT_BREAKER_COOLDOWN seconds instead of being retried on every call.
     
     Args:
         url: URL to scrape
@@ -94,36 +369,41 @@ async def scrape_with_requests(url: str) -> Dict:
     Returns:
         Dictionary with status, title, content, and metadata
     """
-    headers = {"User-Agent": USER_AGENT}
+    client = get_client()
+    try:
+        host = urlparse(url).netloc.lower()
+    except ValueError as e:
+        return _scrape_error("requests", f"{type(e).__name__}: {str(e)}")
     
     for attempt in range(MAX_RETRIES):
+        if _circuit_open(host):
+            return _scrape_error("requests", f"Skipped {host}: too many recent connection failures")
+        
         try:
             
-            response = requests.get(
-                url,
-                headers=headers,
-                timeout=REQUESTS_TIMEOUT,
-                allow_redirects=True
-            )
-            response.raise_for_status()
-            
-            # Handle encoding properly
-            response.encoding = response.apparent_encoding or 'utf-8'
+            # Stream the body and stop at MAX_RESPONSE_BYTES so huge pages
+            # are never fully downloaded or held in memory
+            async with client.stream("GET", url, follow_redirects=True) as response:
+                _record_success(host)
+                response.raise_for_status()
+                body = await read_body(response, MAX_RESPONSE_BYTES)
+                charset = response.charset_encoding
             
-            # Parse HTML
-            soup = BeautifulSoup(response.text, "lxml")
+            # Reuse the extracted text if this exact body was seen before
+            body_key = (hashlib.blake2b(body, digest_size=16).digest(), charset)
+            extracted = _content_cache.get(body_key)
+            if extracted is None:
+                # Parse HTML from raw bytes so the declared charset is honoured
+                # and only a cheap sniff runs when none is given
+                extracted = await asyncio.get_running_loop().run_in_executor(
+                    _parse_executor, parse_page, body, charset, MAX_CONTENT_LENGTH
+                )
+                _content_cache.set(body_key, extracted)
             
-            # Extract title
-            title = ""
-            if soup.title and soup.title.string:
-                title = soup.title.string.strip()
-            
-            # Extract and clean content
-            content = clean_html(soup)
+            title, content, truncated = extracted
             original_length = len(content)
             
             # Limit content length
-            truncated = False
             if len(content) > MAX_CONTENT_LENGTH:
                 content = content[:MAX_CONTENT_LENGTH] + "..."
                 truncated = True
@@ -139,61 +419,32 @@ async def scrape_with_requests(url: str) -> Dict:
                 "truncated": truncated
             }
             
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
+            _record_failure(host)
             if attempt < MAX_RETRIES - 1:
                 await asyncio.sleep(RETRY_DELAY * (attempt + 1))
                 continue
-            return {
-                "status": "error",
-                "method": "requests",
-                "error": f"Request timed out after {REQUESTS_TIMEOUT} seconds",
-                "title": "",
-                "content": "",
-                "length": 0
-            }
+            return _scrape_error("requests", f"Request timed out after {REQUESTS_TIMEOUT} seconds")
             
-        except requests.exceptions.ConnectionError as e:
+        except (httpx.UnsupportedProtocol, httpx.InvalidURL) as e:
+            # A bad URL will never succeed and says nothing about the host
+            return _scrape_error("requests", f"{type(e).__name__}: {str(e)}")
+            
+        except httpx.TransportError as e:
+            _record_failure(host)
             if attempt < MAX_RETRIES - 1:
                 await asyncio.sleep(RETRY_DELAY * (attempt + 1))
                 continue
-            return {
-                "status": "error",
-                "method": "requests",
-                "error": f"Failed to connect to {url}",
-                "title": "",
-                "content": "",
-                "length": 0
-            }
+            return _scrape_error("requests", f"Failed to connect to {url}")
             
-        except requests.exceptions.HTTPError as e:
-            return {
-                "status": "error",
-                "method": "requests",
-                "error": f"HTTP error: {e.response.status_code}",
-                "title": "",
-                "content": "",
-                "length": 0
-            }
+        except httpx.HTTPStatusError as e:
+            return _scrape_error("requests", f"HTTP error: {e.response.status_code}")
             
         except Exception as e:
-            return {
-                "status": "error",
-                "method": "requests",
-                "error": f"{type(e).__name__}: {str(e)}",
-                "title": "",
-                "content": "",
-                "length": 0
-            }
+            return _scrape_error("requests", f"{type(e).__name__}: {str(e)}")
     
     # Should not reach here, but just in case
-    return {
-        "status": "error",
-        "method": "requests",
-        "error": "Max retries exceeded",
-        "title": "",
-        "content": "",
-        "length": 0
-    }
+    return _scrape_error("requests", "Max retries exceeded")
 
 
 async def scrape_with_browser(url: str, wait_time: int = 3) -> Dict:
@@ -211,14 +462,14 @@ async def scrape_with_browser(url: str, wait_time: int = 3) -> Dict:
         page = None
         try:
             
-            browser = await get_browser()
-            page = await browser.new_page(user_agent=USER_AGENT)
+            page = await acquire_page()
             
-            # Navigate to URL and wait for network to be idle
+            # Navigate to URL. With an explicit wait_time the DOM being ready is
+            # enough; otherwise wait for the network to go idle
             await page.goto(
                 url,
                 timeout=BROWSER_TIMEOUT,
-                wait_until="networkidle"
+                wait_until="domcontentloaded" if wait_time > 0 else "networkidle"
             )
             
             # Additional wait for dynamic content (AJAX, lazy loading, etc.)
@@ -230,12 +481,12 @@ async def scrape_with_browser(url: str, wait_time: int = 3) -> Dict:
             title = await page.title() or ""
             
             # Parse rendered HTML
-            soup = BeautifulSoup(html, "lxml")
-            content = clean_html(soup)
+            _, content, truncated = await asyncio.get_running_loop().run_in_executor(
+                _parse_executor, parse_page, html, None, MAX_CONTENT_LENGTH
+            )
             original_length = len(content)
             
             # Limit content length
-            truncated = False
             if len(content) > MAX_CONTENT_LENGTH:
                 content = content[:MAX_CONTENT_LENGTH] + "..."
                 truncated = True
@@ -255,82 +506,110 @@ async def scrape_with_browser(url: str, wait_time: int = 3) -> Dict:
             if attempt < MAX_RETRIES - 1:
                 await asyncio.sleep(RETRY_DELAY * (attempt + 1))
                 continue
-            return {
-                "status": "error",
-                "method": "browser",
-                "error": f"Browser timeout after {BROWSER_TIMEOUT}ms",
-                "title": "",
-                "content": "",
-                "length": 0
-            }
+            return _scrape_error("browser", f"Browser timeout after {BROWSER_TIMEOUT}ms")
             
         except RuntimeError as e:
-            # Playwright not installed - don't retry
-            return {
-                "status": "error",
-                "method": "browser",
-                "error": str(e),
-                "title": "",
-                "content": "",
-                "length": 0
-            }
+            # Playwright missing or the browser failed to launch - don't retry
+            return _scrape_error("browser", str(e))
             
         except Exception as e:
             if attempt < MAX_RETRIES - 1:
                 await asyncio.sleep(RETRY_DELAY * (attempt + 1))
                 continue
-            return {
-                "status": "error",
-                "method": "browser",
-                "error": f"{type(e).__name__}: {str(e)}",
-                "title": "",
-                "content": "",
-                "length": 0
-            }
+            return _scrape_error("browser", f"{type(e).__name__}: {str(e)}")
             
         finally:
-            # Always close the page to free resources
+            # Always hand the page back to the pool
             if page is not None:
-                try:
-                    await page.close()
-                except Exception as e:
-                    pass
+                await release_page(page)
     
     # Should not reach here, but just in case
-    return {
-        "status": "error",
-        "method": "browser",
-        "error": "Max retries exceeded",
-        "title": "",
-        "content": "",
-        "length": 0
-    }
+    return _scrape_error("browser", "Max retries exceeded")
+
+
+def _scrape_key(config: ScrapeConfig) -> Tuple[str, str, int]:
+    """Identify a scrape by (url, method, wait_time); wait_time only matters for the browser."""
+    wait_time = config.wait_time if config.method == "browser" else 0
+    return (config.url, config.method, wait_time)
+
+
+async def _scrape_one(config: ScrapeConfig, semaphore: asyncio.Semaphore) -> Dict:
+    """
+    Scrape a single page, holding a semaphore slot for the duration.
+    
+    Successful results are cached for SCRAPE_CACHE_TTL seconds and served
+    without touching the network.
+    
+    Args:
+        config: Scrape configuration for the page
+        semaphore: Semaphore bounding the number of concurrent scrapes
+        
+    Returns:
+        Dictionary with status, title, content, and metadata
+    """
+    cache_key = _scrape_key(config)
+    wait_time = cache_key[2]
+    
+    cached = _scrape_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+    
+    async with semaphore:
+        if config.method == "requests":
+            result = await scrape_with_requests(config.url)
+        else:
+            result = await scrape_with_browser(config.url, wait_time)
+    
+    if result.get("status") == "success":
+        _scrape_cache.set(cache_key, dict(result))
+    
+    return result
 
 
-async def scrape_pages(configs: List[ScrapeConfig]) -> Dict:
+async def scrape_pages(
+    configs: List[ScrapeConfig],
+    on_progress: Optional[ProgressCallback] = None
+) -> List[Dict]:
     """
     Scrape content from multiple web pages with individual configurations.
     
+    Pages are scraped concurrently, with at most MAX_PARALLEL_SCRAPES
+    in flight at any time. Configs repeating the same (url, method,
+    wait_time) are scraped once and the result is shared.
+    
+    Every record carries the same fields (see _RECORD_DEFAULTS) so the
+    list encodes as a single TOON table instead of one block per page.
+    
     Args:
         configs: List of ScrapeConfig objects
+        on_progress: Optional async callback called with (completed, total)
+            each time a unique page finishes
         
     Returns:
-        Dictionary with results indexed by number (supports multiple requests for same URL)
+        List of result records in the same order as configs (supports
+        multiple requests for same URL)
     """
-    results = {}
+    # Map each distinct scrape to the first config that asked for it
+    unique = {}
+    for config in configs:
+        unique.setdefault(_scrape_key(config), config)
     
-    for idx, config in enumerate(configs):
-        url = config.url
-        method = config.method
-        wait_time = config.wait_time if method == "browser" else 0
-        
-        if method == "requests":
-            result = await scrape_with_requests(url)
-        else:
-            result = await scrape_with_browser(url, wait_time)
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_SCRAPES)
+    outcomes = await gather_with_progress(
+        [_scrape_one(config, semaphore) for config in unique.values()],
+        on_progress
+    )
+    outcome_by_key = dict(zip(unique, outcomes))
+    
+    records = []
+    for config in configs:
+        outcome = outcome_by_key[_scrape_key(config)]
+        if isinstance(outcome, BaseException):
+            outcome = _scrape_error(config.method, f"{type(outcome).__name__}: {str(outcome)}")
         
-        # Use unique key combining index, URL, and method to support multiple scrapes of same URL
-        key = f"{idx}_{url}_{method}"
-        results[key] = result
+        record = {"url": config.url}
+        for field, default in _RECORD_DEFAULTS.items():
+            record[field] = outcome.get(field, default)
+        records.append(record)
     
-    return results
+    return records
@@ -1,18 +1,37 @@
 """SearXNG web search functionality."""
 
 import asyncio
-from typing import Dict, List
+import copy
+from typing import Dict, List, Optional
 
-import requests
+import httpx
+import orjson
 
+from .client import get_client, read_body
 from .config import (
     MAX_NUM_RESULTS,
     MAX_RETRIES,
+    MAX_SEARCH_RESPONSE_BYTES,
     REQUESTS_TIMEOUT,
     RETRY_DELAY,
+    SEARXNG_ENGINES,
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTL,
     SEARXNG_URL,
     USER_AGENT,
 )
+from .utils import ProgressCallback, TTLCache, gather_with_progress
+
+# Headers sent with every SearXNG request
+_SEARXNG_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "X-Forwarded-For": "127.0.0.1",
+    "X-Real-IP": "127.0.0.1",
+    "Accept-Encoding": "gzip, deflate"
+}
+
+# Successful results keyed on (normalized query, num_results, SearXNG URL)
+_search_cache = TTLCache(SEARCH_CACHE_TTL, SEARCH_CACHE_SIZE)
 
 
 def validate_num_results(num_results: int) -> int:
@@ -32,10 +51,18 @@ def validate_num_results(num_results: int) -> int:
     return num_results
 
 
+def _search_error(message: str) -> Dict:
+    """Build the error result for a failed query."""
+    return {"status": "error", "error": message, "count": 0, "results": []}
+
+
 async def search_query(query: str, num_results: int = 5, searxng_url: str = SEARXNG_URL) -> Dict:
     """
     Execute a single search query via SearXNG.
     
+    Successful results are cached for SEARCH_CACHE_TTL seconds; queries
+    differing only in case or whitespace share a cache entry.
+    
     Args:
         query: Search query string
         num_results: Number of results to return (1-50)
@@ -47,133 +74,129 @@ async def search_query(query: str, num_results: int = 5, searxng_url: str = SEAR
     # Validate num_results
     num_results = validate_num_results(num_results)
     
-    headers = {
-        "User-Agent": USER_AGENT,
-        "X-Forwarded-For": "127.0.0.1",
-        "X-Real-IP": "127.0.0.1"
+    # Serve repeated queries from the cache
+    cache_key = (" ".join(query.lower().split()), num_results, searxng_url)
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    
+    # Build the search URL
+    search_url = f"{searxng_url.rstrip('/')}/search"
+    params = {
+        "q": query,
+        "format": "json",
+        "pageno": 1,
     }
+    if SEARXNG_ENGINES:
+        params["engines"] = SEARXNG_ENGINES
+    
+    client = get_client()
     
     for attempt in range(MAX_RETRIES):
         try:
             
-            # Build the search URL
-            search_url = f"{searxng_url.rstrip('/')}/search"
-            params = {
-                "q": query,
-                "format": "json",
-            }
-            
-            # Execute the search request
-            response = requests.get(
+            # Execute the search request, reading at most one byte past the
+            # size limit so oversized responses can be rejected
+            async with client.stream(
+                "GET",
                 search_url,
                 params=params,
-                headers=headers,
-                timeout=REQUESTS_TIMEOUT
-            )
-            response.raise_for_status()
+                headers=_SEARXNG_HEADERS
+            ) as response:
+                response.raise_for_status()
+                body = await read_body(response, MAX_SEARCH_RESPONSE_BYTES + 1)
             
-            # Parse JSON response
-            data = response.json()
-            search_results = data.get("results", [])[:num_results]
+            if len(body) > MAX_SEARCH_RESPONSE_BYTES:
+                return _search_error(f"SearXNG response exceeded {MAX_SEARCH_RESPONSE_BYTES} bytes")
+            
+            # Parse JSON response straight from bytes
+            data = orjson.loads(body)
             
             # Format results into clean structure
-            formatted_results = []
-            for item in search_results:
-                formatted_results.append({
+            formatted_results = [
+                {
                     "title": item.get("title", ""),
                     "url": item.get("url", ""),
                     "content": item.get("content", "")
-                })
-            
+                }
+                for item in data.get("results", [])[:num_results]
+            ]
             
-            return {
+            result = {
                 "status": "success",
                 "count": len(formatted_results),
                 "results": formatted_results
             }
+            _search_cache.set(cache_key, copy.deepcopy(result))
+            
+            return result
             
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             if attempt < MAX_RETRIES - 1:
                 await asyncio.sleep(RETRY_DELAY * (attempt + 1))
                 continue
-            return {
-                "status": "error",
-                "error": f"Request timed out after {REQUESTS_TIMEOUT} seconds",
-                "count": 0,
-                "results": []
-            }
+            return _search_error(f"Request timed out after {REQUESTS_TIMEOUT} seconds")
+            
+        except (httpx.UnsupportedProtocol, httpx.InvalidURL) as e:
+            # A misconfigured SEARXNG_URL will never succeed, so don't retry
+            return _search_error(f"Invalid SearXNG URL {searxng_url}: {str(e)}")
             
-        except requests.exceptions.ConnectionError:
+        except httpx.TransportError:
             if attempt < MAX_RETRIES - 1:
                 await asyncio.sleep(RETRY_DELAY * (attempt + 1))
                 continue
-            return {
-                "status": "error",
-                "error": f"Failed to connect to SearXNG at {searxng_url}",
-                "count": 0,
-                "results": []
-            }
+            return _search_error(f"Failed to connect to SearXNG at {searxng_url}")
             
-        except requests.exceptions.HTTPError as e:
-            return {
-                "status": "error",
-                "error": f"HTTP error: {e.response.status_code}",
-                "count": 0,
-                "results": []
-            }
+        except httpx.HTTPStatusError as e:
+            return _search_error(f"HTTP error: {e.response.status_code}")
             
         except ValueError as e:
-            return {
-                "status": "error",
-                "error": f"Invalid JSON response from SearXNG: {str(e)}",
-                "count": 0,
-                "results": []
-            }
+            return _search_error(f"Invalid JSON response from SearXNG: {str(e)}")
             
         except Exception as e:
-            return {
-                "status": "error",
-                "error": f"Unexpected error: {str(e)}",
-                "count": 0,
-                "results": []
-            }
+            return _search_error(f"Unexpected error: {str(e)}")
     
     # Should not reach here, but just in case
-    return {
-        "status": "error",
-        "error": "Max retries exceeded",
-        "count": 0,
-        "results": []
-    }
+    return _search_error("Max retries exceeded")
 
 
-async def search_web(query_configs: List[dict]) -> Dict:
+async def search_web(
+    query_configs: List[dict],
+    on_progress: Optional[ProgressCallback] = None
+) -> Dict:
     """
     Execute multiple web search queries via SearXNG.
     
+    All queries are sent concurrently over the shared HTTP client, so a
+    batch takes roughly as long as its slowest query.
+    
     Args:
         query_configs: List of dicts, each containing:
             - query: The search query string
             - num_results: Optional number of results (1-50, default 5)
+        on_progress: Optional async callback called with (completed, total)
+            each time a query finishes
         
     Returns:
         Dictionary mapping queries to their results
     """
-    results = {}
+    tasks = [
+        search_query(config["query"], config.get("num_results", 5))
+        for config in query_configs
+        if config.get("query")
+    ]
+    outcomes = iter(await gather_with_progress(tasks, on_progress))
     
+    results = {}
     for config in query_configs:
         query = config.get("query")
         if not query:
-            results["<missing_query>"] = {
-                "status": "error",
-                "error": "Query field is required",
-                "count": 0,
-                "results": []
-            }
+            results["<missing_query>"] = _search_error("Query field is required")
             continue
         
-        num_results = config.get("num_results", 5)
-        result = await search_query(query, num_results)
+        result = next(outcomes)
+        if isinstance(result, BaseException):
+            result = _search_error(f"Unexpected error: {str(result)}")
         results[query] = result
     
     return results
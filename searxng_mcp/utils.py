@@ -1,13 +1,22 @@
 """Utility functions for the SearXNG MCP Server."""
 
+import asyncio
+import time
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Async callback receiving (completed, total) as a batch progresses
+ProgressCallback = Callable[[int, int], Awaitable[Any]]
 
 
 def handle_exceptions(func: Callable) -> Callable:
     """
     Decorator to handle exceptions in async functions.
     
+    Exceptions raised by the wrapped function are converted into a
+    standardized error dictionary (see format_error) with the function
+    name as context, instead of propagating to the caller.
+    
     Args:
         func: Async function to wrap
         
@@ -19,7 +28,7 @@ def handle_exceptions(func: Callable) -> Callable:
         try:
             return await func(*args, **kwargs)
         except Exception as e:
-            raise
+            return format_error(e, func.__name__)
     return wrapper
 
 
@@ -47,3 +56,105 @@ def format_error(error: Exception, context: str = "") -> dict:
         result["context"] = context
     
     return result
+
+
+
+async def gather_with_progress(
+    aws: List[Awaitable],
+    on_progress: Optional[ProgressCallback] = None
+) -> List[Any]:
+    """
+    Run awaitables concurrently, reporting progress as each one finishes.
+    
+    Behaves like ``asyncio.gather(*aws, return_exceptions=True)``: results
+    (or raised exceptions) are returned in input order. Failures of the
+    progress callback itself are ignored so they never affect results.
+    
+    Args:
+        aws: Awaitables to run
+        on_progress: Optional async callback called with (completed, total)
+        
+    Returns:
+        List of results or exceptions, in the same order as ``aws``
+    """
+    if on_progress is None:
+        return await asyncio.gather(*aws, return_exceptions=True)
+    
+    total = len(aws)
+    completed = 0
+    
+    async def run(aw: Awaitable) -> Any:
+        nonlocal completed
+        try:
+            return await aw
+        finally:
+            completed += 1
+            try:
+                await on_progress(completed, total)
+            except Exception as e:
+                pass
+    
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=True)
+
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry and a size bound.
+    
+    Entries older than ``ttl`` seconds are treated as missing. When the
+    cache is full the oldest entry is evicted (FIFO). A ``ttl`` of None
+    keeps entries until they are evicted; a ``ttl`` of 0 or less
+    disables caching entirely.
+    """
+    
+    def __init__(self, ttl: Optional[float], maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are stored at all."""
+        return self.maxsize > 0 and (self.ttl is None or self.ttl > 0)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a cached value.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, value = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the oldest entries if the cache is full.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if not self.enabled:
+            return
+        
+        self._entries.pop(key, None)
+        while len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
+        
+        self._entries[key] = (time.monotonic(), value)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
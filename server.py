@@ -8,21 +8,63 @@ A FastMCP-based MCP server that provides:
 - TOON encoding/decoding for LLM token optimization
 """
 
+import asyncio
+from contextlib import asynccontextmanager
 from typing import List
 
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 from pydantic import Field
 from toon import encode
 from typing_extensions import Annotated
 
-from searxng_mcp.browser import cleanup_browser
+from searxng_mcp.browser import cleanup_browser, get_context
+from searxng_mcp.client import cleanup_client, get_client
+from searxng_mcp.config import PREWARM_BROWSER
 from searxng_mcp.scraper import ScrapeConfig, scrape_pages as scrape_pages_impl
 from searxng_mcp.search import search_web as search_web_impl
 
+
+async def prewarm_browser():
+    """Launch the browser and its shared context ahead of the first scrape."""
+    try:
+        await get_context()
+    except Exception as e:
+        pass  # Browser scrapes will report the error when they run
+
+
+async def shutdown():
+    """Clean up resources on server shutdown."""
+    await cleanup_browser()
+    await cleanup_client()
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """
+    Manage shared resources for the lifetime of the server.
+    
+    The HTTP client is created up front and, unless PREWARM_BROWSER is
+    disabled, the browser is launched in the background so the first
+    browser scrape does not pay the startup cost. Without Playwright or
+    Chromium installed the warm-up fails quickly and is ignored.
+    Everything is released on shutdown.
+    """
+    get_client()
+    warmup = asyncio.create_task(prewarm_browser()) if PREWARM_BROWSER else None
+    
+    try:
+        yield {}
+    finally:
+        if warmup is not None and not warmup.done():
+            warmup.cancel()
+        await shutdown()
+
+
 # Initialize FastMCP server
 mcp = FastMCP(
     name="SearXNG MCP Server",
-    instructions="Multi-query web search via SearXNG + dynamic page scraping with browser support + TOON encoding/decoding for LLM optimization"
+    instructions="Multi-query web search via SearXNG + dynamic page scraping with browser support + TOON encoding/decoding for LLM optimization",
+    lifespan=lifespan
 )
 
 
@@ -31,7 +73,8 @@ async def search_web(
     query_configs: Annotated[
         List[dict],
         Field(description="List of query configurations, each with 'query' and optional 'num_results' (default 5)")
-    ]
+    ],
+    ctx: Context
 ) -> str:
     """
     Execute multiple web search queries via SearXNG.
@@ -51,8 +94,9 @@ async def search_web(
     """
     
     try:
-        results = await search_web_impl(query_configs)
-        encoded_results = encode(results)
+        results = await search_web_impl(query_configs, on_progress=ctx.report_progress)
+        # Encoding large batches is CPU-bound; keep it off the event loop
+        encoded_results = await asyncio.to_thread(encode, results)
         return encoded_results
     except Exception as e:
         error_result = {
@@ -67,29 +111,32 @@ async def scrape_pages(
     configs: Annotated[
         List[ScrapeConfig],
         Field(description="List of scrape configurations, each with URL, method, and wait_time")
-    ]
+    ],
+    ctx: Context
 ) -> str:
     """
     Scrape content from multiple web pages with individual configurations.
 
     Supports two scraping methods per URL:
-    - 'requests': Fast static HTML scraping using requests + BeautifulSoup.
+    - 'requests': Fast static HTML scraping using httpx + lxml.
       Best for traditional server-rendered HTML pages (blogs, docs, static sites).
       Does NOT execute JavaScript - won't work with SPAs or client-side rendered content.
       
     - 'browser': Full browser rendering using Playwright with Chromium.
       Required for JavaScript-heavy sites (React, Next.js, Vue, Angular, SPAs).
       Executes JavaScript and waits for dynamic content to load.
+      Images, media, fonts and stylesheets are not downloaded.
       The browser instance is reused across calls for better performance.
 
     The 'wait_time' parameter only applies to 'browser' method and specifies how many
-    seconds to wait for JavaScript to finish loading (default: 3, range: 0-30).
-    It is ignored for the 'requests' method which returns immediately.
+    seconds to wait for JavaScript to finish loading once the DOM is ready
+    (default: 3, range: 0-30). With 0 the page is read as soon as network activity
+    settles instead. It is ignored for the 'requests' method which returns immediately.
 
     Content is automatically cleaned by removing scripts, styles, and other non-content
     elements. Output is limited to 10,000 characters per page by default to prevent
-    context overflow. Multiple scrapes of the same URL are supported by using unique
-    keys in the format: {index}_{url}_{method}.
+    context overflow. Results are returned as a list in the same order as configs,
+    so multiple scrapes of the same URL are supported.
     
     Includes retry logic with exponential backoff for robust operation.
 
@@ -97,12 +144,13 @@ async def scrape_pages(
         configs: List of ScrapeConfig objects, each with url, method, and wait_time
 
     Returns:
-        TOON-formatted string containing scraped content indexed by {index}_{url}_{method}
+        TOON-formatted string with a 'results' table holding one record per config
     """
     
     try:
-        results = await scrape_pages_impl(configs)
-        encoded_results = encode(results)
+        records = await scrape_pages_impl(configs, on_progress=ctx.report_progress)
+        # Encoding large batches is CPU-bound; keep it off the event loop
+        encoded_results = await asyncio.to_thread(encode, {"results": records})
         return encoded_results
     except Exception as e:
         error_result = {
@@ -112,17 +160,8 @@ async def scrape_pages(
         return encode(error_result)
 
 
-# Cleanup handler for graceful shutdown
-async def shutdown():
-    """Clean up resources on server shutdown."""
-    await cleanup_browser()
-
-
 if __name__ == "__main__":
     try:
         mcp.run()
     except KeyboardInterrupt:
         pass
-    finally:
-        import asyncio
-        asyncio.run(shutdown())